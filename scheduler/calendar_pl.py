@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-from datetime import date, timedelta
+from datetime import date
+from functools import lru_cache
 
 
+@lru_cache(maxsize=None)
 def _easter_sunday(year: int) -> date:
     """Return Easter Sunday for the given year (Gregorian calendar)."""
     a = year % 19
@@ -24,7 +26,8 @@ def _easter_sunday(year: int) -> date:
     return date(year, month, day)
 
 
-def polish_holidays(year: int) -> set[date]:
+@lru_cache(maxsize=None)
+def polish_holidays(year: int) -> frozenset[date]:
     fixed = {
         date(year, 1, 1),
         date(year, 1, 6),
@@ -36,24 +39,35 @@ def polish_holidays(year: int) -> set[date]:
         date(year, 12, 25),
         date(year, 12, 26),
     }
-    easter = _easter_sunday(year)
+    easter_ordinal = _easter_sunday(year).toordinal()
     movable = {
-        easter,
-        easter + timedelta(days=1),  # Easter Monday
-        easter + timedelta(days=49),  # Pentecost (Zielone Swiatki)
-        easter + timedelta(days=60),  # Corpus Christi (Boze Cialo)
+        date.fromordinal(easter_ordinal + offset)
+        for offset in (
+            0,  # Easter Sunday
+            1,  # Easter Monday
+            49,  # Pentecost (Zielone Swiatki)
+            60,  # Corpus Christi (Boze Cialo)
+        )
     }
-    return fixed | movable
+    return frozenset(fixed | movable)
 
 
 def is_weekend(day: date) -> bool:
     return day.weekday() >= 5
 
 
+@lru_cache(maxsize=4096)
 def is_holiday(day: date) -> bool:
+    # Raporty i solver odpytuja te same daty w kolko; roczny zbior swiat
+    # jest juz cache'owany, tu znika jeszcze hash roku + membership.
     return day in polish_holidays(day.year)
 
 
+def day_off_flags(days: list[date]) -> list[bool]:
+    """Return a per-day flag: True when the day is a weekend or holiday."""
+    return [is_weekend(day) or is_holiday(day) for day in days]
+
+
 def month_days(ym: str) -> list[date]:
     year_str, month_str = ym.split("-", 1)
     year = int(year_str)
@@ -63,9 +77,7 @@ def month_days(ym: str) -> list[date]:
         next_month = date(year + 1, 1, 1)
     else:
         next_month = date(year, month + 1, 1)
-    days: list[date] = []
-    current = first
-    while current < next_month:
-        days.append(current)
-        current += timedelta(days=1)
-    return days
+    return [
+        date.fromordinal(ordinal)
+        for ordinal in range(first.toordinal(), next_month.toordinal())
+    ]
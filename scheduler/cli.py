@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import argparse
 import importlib.util
+from dataclasses import asdict
 from pathlib import Path
 
 from scheduler.demand import build_demands
@@ -27,6 +28,18 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         action="store_true",
         help="Print normalized shifts table",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Number of parallel CP-SAT search workers (0 = all CPU cores)",
+    )
+    parser.add_argument(
+        "--time-limit-s",
+        type=float,
+        default=None,
+        help="Solver time limit in seconds (default: no limit)",
+    )
     parser.add_argument(
         "--print-demands",
         action="store_true",
@@ -44,12 +57,10 @@ def _format_table(rows: list[dict[str, object]]) -> str:
     for row in str_rows:
         for idx, cell in enumerate(row):
             widths[idx] = max(widths[idx], len(cell))
-    header_line = " | ".join(header.ljust(widths[idx]) for idx, header in enumerate(headers))
+    row_format = " | ".join(f"{{:<{width}}}" for width in widths)
+    header_line = row_format.format(*headers)
     separator_line = "-+-".join("-" * width for width in widths)
-    data_lines = [
-        " | ".join(cell.ljust(widths[idx]) for idx, cell in enumerate(row))
-        for row in str_rows
-    ]
+    data_lines = [row_format.format(*row) for row in str_rows]
     return "\n".join([header_line, separator_line, *data_lines])
 
 
@@ -67,25 +78,28 @@ def main(argv: list[str] | None = None) -> None:
     input_path = Path(args.input)
     if not input_path.is_file():
         raise SystemExit(f"ERROR: input file not found: {input_path}")
+    # Wczytujemy Excela raz; bloki --print-* tylko renderuja z pamieci.
+    employees = load_employees(input_path)
+    shifts = load_shifts(input_path)
+    demands = build_demands(args.month, shifts)
     if args.print_employees:
-        employees = load_employees(input_path)
-        rows = [employee.model_dump() for employee in employees]
+        rows = [asdict(employee) for employee in employees]
         print(_render_table(rows))
     if args.print_shifts:
-        shifts = load_shifts(input_path)
-        rows = [shift.model_dump() for shift in shifts.values()]
+        rows = [asdict(shift) for shift in shifts.values()]
         print(_render_table(rows))
     if args.print_demands:
-        shifts = load_shifts(input_path)
-        demands = build_demands(args.month, shifts)
-        rows = [demand.model_dump() for demand in demands]
+        rows = [asdict(demand) for demand in demands]
         print(f"Demands total: {len(rows)}")
         if rows:
             print(_render_table(rows[:20]))
-    employees = load_employees(input_path)
-    shifts = load_shifts(input_path)
-    demands = build_demands(args.month, shifts)
-    solve_result = solve_schedule(employees, demands, shifts)
+    solve_result = solve_schedule(
+        employees,
+        demands,
+        shifts,
+        num_workers=args.workers,
+        time_limit_s=args.time_limit_s,
+    )
     export_schedule_excel(
         args.out,
         args.month,
@@ -2,11 +2,33 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+import os
+from collections.abc import Callable
 
 from ortools.sat.python import cp_model
 
-from scheduler.domain import Demand, Employee, ShiftType
+from scheduler.domain import Demand, Employee, ShiftType, required_skill_mask
+
+# Gesta tablica zmiennych decyzyjnych: [e_idx][d_idx][s_idx], None = niedostepne.
+DecisionVars = list[list[list["cp_model.IntVar | None"]]]
+
+
+def shift_code_index(shifts: dict[str, ShiftType]) -> dict[str, int]:
+    return {shift_code: s_idx for s_idx, shift_code in enumerate(shifts)}
+
+
+def name_formatter(debug_names: bool | None = None) -> Callable[..., str]:
+    """Zwroc funkcje budujaca nazwy zmiennych CP-SAT.
+
+    Nazwy sluza tylko do debugowania, a kosztuja pamiec i czas przy
+    budowie modelu, wiec domyslnie zwracamy pusty string. Wlaczenie:
+    debug_names=True albo SCHEDULER_DEBUG_NAMES=1.
+    """
+    if debug_names is None:
+        debug_names = os.environ.get("SCHEDULER_DEBUG_NAMES") == "1"
+    if debug_names:
+        return lambda *parts: "".join(map(str, parts))
+    return lambda *parts: ""
 
 
 def eligible_for_shift(employee: Employee, shift: ShiftType) -> bool:
@@ -14,15 +36,26 @@ def eligible_for_shift(employee: Employee, shift: ShiftType) -> bool:
         return False
     if shift.is_24h and not employee.moze_24h:
         return False
-    if shift.modalnosc == "MR" and "MR" not in employee.skills:
-        return False
-    if shift.modalnosc == "TK" and "TK" not in employee.skills:
-        return False
-    if shift.modalnosc == "ZDO" and "ZDO" not in employee.skills:
-        return False
-    if shift.modalnosc == "ALL" and employee.grupa != "ELEKTRORADIOLOG":
-        return False
-    return True
+    required = required_skill_mask(shift.modalnosc)
+    return (employee.skill_bits & required) == required
+
+
+def build_eligibility(
+    employees: list[Employee],
+    shifts: dict[str, ShiftType],
+) -> dict[tuple[int, str], bool]:
+    """Precompute eligibility per (employee index, shift code), day-independent."""
+    employee_masks = [employee.skill_bits for employee in employees]
+    eligibility: dict[tuple[int, str], bool] = {}
+    for shift_code, shift in shifts.items():
+        required = required_skill_mask(shift.modalnosc)
+        for e_idx, employee in enumerate(employees):
+            eligibility[(e_idx, shift_code)] = (
+                employee.grupa == shift.grupa
+                and (employee_masks[e_idx] & required) == required
+                and (not shift.is_24h or employee.moze_24h)
+            )
+    return eligibility
 
 
 def build_decision_vars(
@@ -30,15 +63,24 @@ def build_decision_vars(
     employees: list[Employee],
     days: list,  # list[date]
     shifts: dict[str, ShiftType],
-) -> dict[tuple[int, int, str], cp_model.IntVar]:
-    variables: dict[tuple[int, int, str], cp_model.IntVar] = {}
-    for e_idx, employee in enumerate(employees):
+    eligibility: dict[tuple[int, str], bool],
+    debug_names: bool | None = None,
+) -> DecisionVars:
+    shift_codes = list(shifts.keys())
+    fmt = name_formatter(debug_names)
+    variables: DecisionVars = []
+    for e_idx, _employee in enumerate(employees):
+        employee_days: list[list[cp_model.IntVar | None]] = []
         for d_idx, _day in enumerate(days):
-            for shift_code, shift in shifts.items():
-                if not eligible_for_shift(employee, shift):
-                    continue
-                name = f"x_e{e_idx}_d{d_idx}_s{shift_code}"
-                variables[(e_idx, d_idx, shift_code)] = model.new_bool_var(name)
+            day_vars: list[cp_model.IntVar | None] = []
+            for shift_code in shift_codes:
+                if eligibility[(e_idx, shift_code)]:
+                    name = fmt("x_e", e_idx, "_d", d_idx, "_s", shift_code)
+                    day_vars.append(model.new_bool_var(name))
+                else:
+                    day_vars.append(None)
+            employee_days.append(day_vars)
+        variables.append(employee_days)
     return variables
 
 
@@ -48,17 +90,30 @@ def add_min_coverage(
     days: list,  # list[date]
     employees: list[Employee],
     shifts: dict[str, ShiftType],
-    variables: dict[tuple[int, int, str], cp_model.IntVar],
+    variables: DecisionVars,
+    eligibility: dict[tuple[int, str], bool],
+    code_index: dict[str, int] | None = None,
 ) -> None:
-    day_index = {day: idx for idx, day in enumerate(days)}
+    # Dni miesiaca sa ciagle, wiec indeks dnia to roznica ordinali.
+    base_ordinal = days[0].toordinal()
+    assert days[-1].toordinal() - base_ordinal == len(days) - 1
+    if code_index is None:
+        code_index = shift_code_index(shifts)
+    # Listy uprawnionych pracownikow per zmiana - niezalezne od dnia.
+    eligible_by_shift = {
+        shift_code: [
+            e_idx
+            for e_idx in range(len(employees))
+            if eligibility[(e_idx, shift_code)]
+        ]
+        for shift_code in shifts
+    }
     for demand in demands:
-        d_idx = day_index[demand.date]
-        shift = shifts[demand.shift_code]
+        d_idx = demand.date.toordinal() - base_ordinal
+        s_idx = code_index[demand.shift_code]
         eligible_vars = [
-            variables[(e_idx, d_idx, demand.shift_code)]
-            for e_idx, employee in enumerate(employees)
-            if eligible_for_shift(employee, shift)
-            and (e_idx, d_idx, demand.shift_code) in variables
+            variables[e_idx][d_idx][s_idx]
+            for e_idx in eligible_by_shift[demand.shift_code]
         ]
         if eligible_vars:
             model.add(sum(eligible_vars) >= demand.min_staff)
@@ -71,57 +126,47 @@ def add_one_shift_per_day(
     employees: list[Employee],
     days: list,  # list[date]
     shifts: dict[str, ShiftType],
-    variables: dict[tuple[int, int, str], cp_model.IntVar],
+    variables: DecisionVars,
 ) -> None:
-    shift_codes = list(shifts.keys())
     for e_idx, _employee in enumerate(employees):
         for d_idx, _day in enumerate(days):
-            day_vars = [
-                variables[key]
-                for shift_code in shift_codes
-                if (key := (e_idx, d_idx, shift_code)) in variables
-            ]
+            day_vars = [var for var in variables[e_idx][d_idx] if var is not None]
             if day_vars:
                 model.add(sum(day_vars) <= 1)
 
 
-def _shift_end_datetime(day, shift: ShiftType) -> datetime:
-    start_dt = datetime.combine(day, shift.start_time)
-    end_dt = datetime.combine(day, shift.end_time)
-    if shift.end_time <= shift.start_time:
-        end_dt += timedelta(days=1)
-    if shift.is_24h and shift.end_time == shift.start_time:
-        end_dt = start_dt + timedelta(days=24)
-    return end_dt
-
-
 def add_rest_constraints(
     model: cp_model.CpModel,
     employees: list[Employee],
     days: list,  # list[date]
     shifts: dict[str, ShiftType],
-    variables: dict[tuple[int, int, str], cp_model.IntVar],
+    variables: DecisionVars,
     min_rest_hours: int = 11,
 ) -> None:
-    shift_codes = list(shifts.keys())
+    offsets = [(shift.start_min, shift.end_min) for shift in shifts.values()]
+    min_rest_min = min_rest_hours * 60
+    # Pary (zmiana dnia d, zmiana dnia d+1) lamiace odpoczynek - niezalezne od dnia.
+    forbidden = [
+        (a_idx, b_idx)
+        for a_idx, (_, end_a) in enumerate(offsets)
+        for b_idx, (start_b, _) in enumerate(offsets)
+        if 24 * 60 + start_b - end_a < min_rest_min
+    ]
+    if not forbidden:
+        return
     for e_idx, _employee in enumerate(employees):
-        for d_idx, day in enumerate(days[:-1]):
-            next_day = days[d_idx + 1]
-            for shift_code_a in shift_codes:
-                shift_a = shifts[shift_code_a]
-                key_a = (e_idx, d_idx, shift_code_a)
-                if key_a not in variables:
+        employee_days = variables[e_idx]
+        for d_idx in range(len(days) - 1):
+            day_vars = employee_days[d_idx]
+            next_day_vars = employee_days[d_idx + 1]
+            for a_idx, b_idx in forbidden:
+                var_a = day_vars[a_idx]
+                if var_a is None:
+                    continue
+                var_b = next_day_vars[b_idx]
+                if var_b is None:
                     continue
-                end_a = _shift_end_datetime(day, shift_a)
-                for shift_code_b in shift_codes:
-                    shift_b = shifts[shift_code_b]
-                    key_b = (e_idx, d_idx + 1, shift_code_b)
-                    if key_b not in variables:
-                        continue
-                    start_b = datetime.combine(next_day, shift_b.start_time)
-                    rest_hours = (start_b - end_a).total_seconds() / 3600.0
-                    if rest_hours < min_rest_hours:
-                        model.add(variables[key_a] + variables[key_b] <= 1)
+                model.add(var_a + var_b <= 1)
 
 
 def add_max_consecutive_days(
@@ -129,23 +174,27 @@ def add_max_consecutive_days(
     employees: list[Employee],
     days: list,  # list[date]
     shifts: dict[str, ShiftType],
-    variables: dict[tuple[int, int, str], cp_model.IntVar],
+    variables: DecisionVars,
     max_days: int = 6,
 ) -> None:
-    shift_codes = list(shifts.keys())
     window_size = max_days + 1
     if len(days) < window_size:
         return
     for e_idx, _employee in enumerate(employees):
-        for start in range(0, len(days) - window_size + 1):
-            work_vars = []
-            for d_idx in range(start, start + window_size):
-                day_vars = [
-                    variables[key]
-                    for shift_code in shift_codes
-                    if (key := (e_idx, d_idx, shift_code)) in variables
-                ]
-                if day_vars:
-                    work_vars.extend(day_vars)
-            if work_vars:
-                model.add(sum(work_vars) <= max_days)
+        per_day_vars = [
+            [var for var in variables[e_idx][d_idx] if var is not None]
+            for d_idx in range(len(days))
+        ]
+        # Okno przesuwne: zdejmij zmienne pierwszego dnia, dolacz nowy dzien.
+        window: list[cp_model.IntVar] = [
+            var for day_vars in per_day_vars[:window_size] for var in day_vars
+        ]
+        if window:
+            model.add(sum(window) <= max_days)
+        for start in range(1, len(days) - window_size + 1):
+            window = (
+                window[len(per_day_vars[start - 1]):]
+                + per_day_vars[start + window_size - 1]
+            )
+            if window:
+                model.add(sum(window) <= max_days)
@@ -8,6 +8,7 @@ from datetime import date
 from ortools.sat.python import cp_model
 
 from scheduler import calendar_pl
+from scheduler.constraints_hard import DecisionVars, name_formatter
 from scheduler.domain import Employee, Settings, ShiftType
 
 MINUTES_PER_HOUR = 60
@@ -21,20 +22,8 @@ def _minutes_from_hours(hours: float | None) -> int | None:
     return int(round(hours * MINUTES_PER_HOUR))
 
 
-def _shift_minutes(shift: ShiftType) -> int:
-    return int(round(shift.duration_h * MINUTES_PER_HOUR))
-
-
-def _count_workdays(days: list[date]) -> int:
-    return sum(
-        1
-        for day in days
-        if not calendar_pl.is_weekend(day) and not calendar_pl.is_holiday(day)
-    )
-
-
-def _get_weight(settings: Settings, key: str, default: float) -> int:
-    return int(round(settings.wagi_miekkie.get(key, default)))
+def _count_workdays(day_flags: list[bool]) -> int:
+    return sum(1 for is_day_off in day_flags if not is_day_off)
 
 
 def _employee_target_minutes(employee: Employee, workdays: int) -> int | None:
@@ -58,179 +47,206 @@ def add_soft_constraints(
     employees: list[Employee],
     days: list[date],
     shifts: dict[str, ShiftType],
-    variables: dict[tuple[int, int, str], cp_model.IntVar],
+    variables: DecisionVars,
     settings: Settings | None = None,
+    debug_names: bool | None = None,
 ) -> None:
     if settings is None:
         settings = Settings()
+    fmt = name_formatter(debug_names)
 
-    shift_minutes = {code: _shift_minutes(shift) for code, shift in shifts.items()}
-    max_shift_minutes = max(shift_minutes.values(), default=0)
+    shift_list = list(shifts.values())
+    shift_minutes = [shift.duration_min for shift in shift_list]
+    max_shift_minutes = max(shift_minutes, default=0)
     total_days = len(days)
     total_max_minutes = total_days * max_shift_minutes
-    workdays = _count_workdays(days)
+    day_flags = calendar_pl.day_off_flags(days)
+    workdays = _count_workdays(day_flags)
+    week_buckets = _week_buckets(days)
+    night_mask = [
+        shift.end_time <= shift.start_time and not shift.is_24h
+        for shift in shift_list
+    ]
+    h24_mask = [shift.is_24h for shift in shift_list]
 
     penalty_terms: list[cp_model.LinearExpr] = []
 
-    weight_max = _get_weight(settings, "max_hours", 1000.0)
-    weight_min = _get_weight(settings, "min_hours", 500.0)
-    weight_target = _get_weight(settings, "target_hours", 100.0)
-    weight_weekly = _get_weight(settings, "weekly_48h", 500.0)
-    weight_balance = _get_weight(settings, "balance", 50.0)
-
-    shift_codes = list(shifts.keys())
-    day_index = {day: idx for idx, day in enumerate(days)}
+    # Wagi czytane wprost z pol Settings - bez slownikowego posrednika.
+    weight_max = settings.w_max_hours_over
+    weight_min = settings.w_min_hours_under
+    weight_target = settings.w_target_hours_dev
+    weight_weekly = settings.w_b2b_48h_week_over
+    balance_weights = {
+        "night": settings.w_balance_nights,
+        "weekend": settings.w_balance_weekends,
+        "shift_24h": settings.w_balance_24h,
+    }
 
     total_group_counts: dict[tuple[str, str], cp_model.IntVar] = {}
     employee_metric_counts: dict[tuple[int, str], cp_model.IntVar] = {}
 
     for e_idx, employee in enumerate(employees):
-        total_minutes = model.new_int_var(0, total_max_minutes, f"minutes_e{e_idx}")
-        minute_terms = []
-        for d_idx, _day in enumerate(days):
-            for shift_code in shift_codes:
-                key = (e_idx, d_idx, shift_code)
-                var = variables.get(key)
+        total_minutes = model.new_int_var(0, total_max_minutes, fmt("minutes_e", e_idx))
+        # Rownolegle listy zmiennych i wag - jedna suma wazona po stronie C
+        # zamiast posrednich obiektow LinearExpr per skladnik.
+        minute_vars = []
+        minute_weights = []
+        for day_vars in variables[e_idx]:
+            for s_idx, var in enumerate(day_vars):
                 if var is None:
                     continue
-                minute_terms.append(var * shift_minutes[shift_code])
-        if minute_terms:
-            model.add(total_minutes == sum(minute_terms))
+                minute_vars.append(var)
+                minute_weights.append(shift_minutes[s_idx])
+        if minute_vars:
+            model.add(
+                total_minutes
+                == cp_model.LinearExpr.weighted_sum(minute_vars, minute_weights)
+            )
         else:
             model.add(total_minutes == 0)
 
         min_minutes, max_minutes = _employee_min_max_minutes(employee)
         target_minutes = _employee_target_minutes(employee, workdays)
 
+        # Kary typu max(0, x) i |x| modelujemy jednostronnymi ograniczeniami;
+        # minimalizacja dociska zmienna kary do wartosci dokladnej.
         if max_minutes is not None:
-            diff = model.new_int_var(-total_max_minutes, total_max_minutes, f"excess_diff_e{e_idx}")
-            model.add(diff == total_minutes - max_minutes)
-            excess = model.new_int_var(0, total_max_minutes, f"excess_e{e_idx}")
-            model.add_max_equality(excess, [diff, 0])
+            excess = model.new_int_var(0, total_max_minutes, fmt("excess_e", e_idx))
+            model.add(excess >= total_minutes - max_minutes)
             penalty_terms.append(weight_max * excess)
 
         if min_minutes is not None:
-            diff = model.new_int_var(-total_max_minutes, total_max_minutes, f"short_diff_e{e_idx}")
-            model.add(diff == min_minutes - total_minutes)
-            shortage = model.new_int_var(0, total_max_minutes, f"short_e{e_idx}")
-            model.add_max_equality(shortage, [diff, 0])
+            shortage = model.new_int_var(0, total_max_minutes, fmt("short_e", e_idx))
+            model.add(shortage >= min_minutes - total_minutes)
             penalty_terms.append(weight_min * shortage)
 
         if target_minutes is not None:
-            deviation = model.new_int_var(0, total_max_minutes, f"dev_target_e{e_idx}")
-            model.add_abs_equality(deviation, total_minutes - target_minutes)
+            deviation = model.new_int_var(0, total_max_minutes, fmt("dev_target_e", e_idx))
+            model.add(deviation >= total_minutes - target_minutes)
+            model.add(deviation >= target_minutes - total_minutes)
             penalty_terms.append(weight_target * deviation)
 
         if employee.typ_umowy in {"B2B", "ZLECENIE"}:
             _add_weekly_limit_penalties(
                 model,
                 e_idx,
-                days,
-                shift_codes,
+                week_buckets,
                 shift_minutes,
                 variables,
                 weight_weekly,
                 penalty_terms,
+                total_max_minutes,
+                fmt,
             )
 
         _add_balance_counts(
             model,
-            employee,
             e_idx,
             days,
-            shift_codes,
-            shifts,
+            day_flags,
+            night_mask,
+            h24_mask,
             variables,
             employee_metric_counts,
+            fmt,
         )
 
     _add_balance_penalties(
         model,
         employees,
         employee_metric_counts,
-        weight_balance,
+        balance_weights,
         penalty_terms,
         total_group_counts,
         len(days),
+        fmt,
     )
 
     if penalty_terms:
         model.minimize(sum(penalty_terms))
 
 
+def _week_buckets(days: list[date]) -> list[list[int]]:
+    """Pogrupuj indeksy dni wg tygodnia ISO - raz dla wszystkich pracownikow."""
+    weeks: dict[tuple[int, int], list[int]] = defaultdict(list)
+    for d_idx, day in enumerate(days):
+        iso = day.isocalendar()
+        weeks[(iso.year, iso.week)].append(d_idx)
+    return list(weeks.values())
+
+
 def _add_weekly_limit_penalties(
     model: cp_model.CpModel,
     e_idx: int,
-    days: list[date],
-    shift_codes: list[str],
-    shift_minutes: dict[str, int],
-    variables: dict[tuple[int, int, str], cp_model.IntVar],
+    week_buckets: list[list[int]],
+    shift_minutes: list[int],
+    variables: DecisionVars,
     weight: int,
     penalty_terms: list[cp_model.LinearExpr],
+    max_week_minutes: int,
+    fmt,
 ) -> None:
-    weeks: dict[tuple[int, int], list[int]] = defaultdict(list)
-    for d_idx, day in enumerate(days):
-        weeks[(day.isocalendar().year, day.isocalendar().week)].append(d_idx)
-
-    max_week_minutes = len(days) * max(shift_minutes.values(), default=0)
-
-    for _, indices in weeks.items():
-        week_minutes_terms = []
+    for indices in week_buckets:
+        week_vars = []
+        week_weights = []
         for d_idx in indices:
-            for shift_code in shift_codes:
-                key = (e_idx, d_idx, shift_code)
-                var = variables.get(key)
+            for s_idx, var in enumerate(variables[e_idx][d_idx]):
                 if var is None:
                     continue
-                week_minutes_terms.append(var * shift_minutes[shift_code])
-        if not week_minutes_terms:
+                week_vars.append(var)
+                week_weights.append(shift_minutes[s_idx])
+        if not week_vars:
             continue
-        week_minutes = model.new_int_var(0, max_week_minutes, f"week_minutes_e{e_idx}_{indices[0]}")
-        model.add(week_minutes == sum(week_minutes_terms))
-        diff = model.new_int_var(-max_week_minutes, max_week_minutes, f"week_diff_e{e_idx}_{indices[0]}")
-        model.add(diff == week_minutes - WEEKLY_LIMIT_MINUTES)
-        excess = model.new_int_var(0, max_week_minutes, f"week_excess_e{e_idx}_{indices[0]}")
-        model.add_max_equality(excess, [diff, 0])
+        # excess >= max(0, minuty - limit); minimalizacja dociska do rownosci,
+        # wiec posrednie zmienne week_minutes/diff i add_max_equality sa zbedne.
+        excess = model.new_int_var(
+            0, max_week_minutes, fmt("week_excess_e", e_idx, "_", indices[0])
+        )
+        model.add(
+            excess
+            >= cp_model.LinearExpr.weighted_sum(week_vars, week_weights)
+            - WEEKLY_LIMIT_MINUTES
+        )
         penalty_terms.append(weight * excess)
 
 
 def _add_balance_counts(
     model: cp_model.CpModel,
-    employee: Employee,
     e_idx: int,
     days: list[date],
-    shift_codes: list[str],
-    shifts: dict[str, ShiftType],
-    variables: dict[tuple[int, int, str], cp_model.IntVar],
+    day_flags: list[bool],
+    night_mask: list[bool],
+    h24_mask: list[bool],
+    variables: DecisionVars,
     employee_metric_counts: dict[tuple[int, str], cp_model.IntVar],
+    fmt,
 ) -> None:
-    metrics = {
-        "night": lambda shift: shift.end_time <= shift.start_time and not shift.is_24h,
-        "weekend": lambda shift: False,
-        "shift_24h": lambda shift: shift.is_24h,
-    }
-
-    for metric in metrics:
-        max_count = len(days)
-        count_var = model.new_int_var(0, max_count, f"{metric}_count_e{e_idx}")
-        terms = []
-        for d_idx, day in enumerate(days):
-            is_weekend = calendar_pl.is_weekend(day) or calendar_pl.is_holiday(day)
-            for shift_code in shift_codes:
-                shift = shifts[shift_code]
-                if shift.grupa != employee.grupa:
-                    continue
-                if metric == "weekend" and not is_weekend:
-                    continue
-                if metric != "weekend" and not metrics[metric](shift):
-                    continue
-                key = (e_idx, d_idx, shift_code)
-                var = variables.get(key)
-                if var is None:
-                    continue
-                terms.append(var)
+    # Jeden przebieg po (dzien, zmiana); zmienne istnieja tylko dla
+    # uprawnionych kombinacji, wiec filtr grupy jest juz zalatwiony.
+    night_terms: list[cp_model.IntVar] = []
+    weekend_terms: list[cp_model.IntVar] = []
+    h24_terms: list[cp_model.IntVar] = []
+    for d_idx, day_vars in enumerate(variables[e_idx]):
+        is_weekend = day_flags[d_idx]
+        for s_idx, var in enumerate(day_vars):
+            if var is None:
+                continue
+            if night_mask[s_idx]:
+                night_terms.append(var)
+            if h24_mask[s_idx]:
+                h24_terms.append(var)
+            if is_weekend:
+                weekend_terms.append(var)
+
+    max_count = len(days)
+    for metric, terms in (
+        ("night", night_terms),
+        ("weekend", weekend_terms),
+        ("shift_24h", h24_terms),
+    ):
+        count_var = model.new_int_var(0, max_count, fmt(metric, "_count_e", e_idx))
         if terms:
-            model.add(count_var == sum(terms))
+            model.add(count_var == cp_model.LinearExpr.sum(terms))
         else:
             model.add(count_var == 0)
         employee_metric_counts[(e_idx, metric)] = count_var
@@ -240,10 +256,11 @@ def _add_balance_penalties(
     model: cp_model.CpModel,
     employees: list[Employee],
     employee_metric_counts: dict[tuple[int, str], cp_model.IntVar],
-    weight: int,
+    weights: dict[str, int],
     penalty_terms: list[cp_model.LinearExpr],
     total_group_counts: dict[tuple[str, str], cp_model.IntVar],
     days_len: int,
+    fmt,
 ) -> None:
     if not employees:
         return
@@ -256,15 +273,16 @@ def _add_balance_penalties(
         group_size = len(indices)
         for metric in ("night", "weekend", "shift_24h"):
             total_max = len(indices) * days_len
-            total_var = model.new_int_var(0, total_max, f"total_{metric}_{group}")
+            total_var = model.new_int_var(0, total_max, fmt("total_", metric, "_", group))
             terms = [employee_metric_counts[(idx, metric)] for idx in indices]
             if terms:
-                model.add(total_var == sum(terms))
+                model.add(total_var == cp_model.LinearExpr.sum(terms))
             else:
                 model.add(total_var == 0)
             for idx in indices:
                 count_var = employee_metric_counts[(idx, metric)]
-                dev = model.new_int_var(0, total_max * group_size, f"dev_{metric}_{group}_{idx}")
-                model.add_abs_equality(dev, count_var * group_size - total_var)
-                penalty_terms.append(weight * dev)
+                dev = model.new_int_var(0, total_max * group_size, fmt("dev_", metric, "_", group, "_", idx))
+                model.add(dev >= count_var * group_size - total_var)
+                model.add(dev >= total_var - count_var * group_size)
+                penalty_terms.append(weights[metric] * dev)
             total_group_counts[(group, metric)] = total_var
@@ -2,29 +2,28 @@
 
 from __future__ import annotations
 
+from collections import defaultdict
 from collections.abc import Iterable
 
 from scheduler import calendar_pl
 from scheduler.domain import Demand, ShiftType
 
 
-def _find_shifts(
+def _shift_buckets(
     shifts: Iterable[ShiftType],
-    *,
-    grupa: str,
-    modalnosc: str | None = None,
-    is_24h: bool | None = None,
-) -> list[ShiftType]:
-    result: list[ShiftType] = []
+) -> dict[tuple[object, object, bool], list[ShiftType]]:
+    """Zindeksuj zmiany po (grupa, modalnosc, czy_24h); None = dowolna modalnosc.
+
+    Kazdy kubelek jest posortowany po godzinie startu, wiec [0] to zmiana
+    dzienna a [-1] nocna.
+    """
+    buckets: dict[tuple[object, object, bool], list[ShiftType]] = defaultdict(list)
     for shift in shifts:
-        if shift.grupa != grupa:
-            continue
-        if modalnosc is not None and shift.modalnosc != modalnosc:
-            continue
-        if is_24h is not None and shift.is_24h != is_24h:
-            continue
-        result.append(shift)
-    return sorted(result, key=lambda item: item.start_time)
+        buckets[(shift.grupa, shift.modalnosc, shift.is_24h)].append(shift)
+        buckets[(shift.grupa, None, shift.is_24h)].append(shift)
+    for bucket in buckets.values():
+        bucket.sort(key=lambda item: item.start_time)
+    return buckets
 
 
 def build_demands(
@@ -33,80 +32,54 @@ def build_demands(
     calendar_module=calendar_pl,
 ) -> list[Demand]:
     days = calendar_module.month_days(month)
-    shift_values = list(shifts.values())
+    buckets = _shift_buckets(shifts.values())
 
-    er_24h = _find_shifts(
-        shift_values, grupa="ELEKTRORADIOLOG", is_24h=True
-    )
+    er_24h = buckets.get(("ELEKTRORADIOLOG", None, True), [])
     if not er_24h:
         raise ValueError("Brak zmiany 24h dla ELEKTRORADIOLOG")
 
-    er_mr = _find_shifts(
-        shift_values, grupa="ELEKTRORADIOLOG", modalnosc="MR", is_24h=False
-    )
-    er_tk = _find_shifts(
-        shift_values, grupa="ELEKTRORADIOLOG", modalnosc="TK", is_24h=False
-    )
+    er_mr = buckets.get(("ELEKTRORADIOLOG", "MR", False), [])
+    er_tk = buckets.get(("ELEKTRORADIOLOG", "TK", False), [])
     if not er_mr:
         raise ValueError("Brak zmiany dziennej MR dla ELEKTRORADIOLOG")
     if len(er_tk) < 2:
         raise ValueError("Brak zmian dziennych/nocnych TK dla ELEKTRORADIOLOG")
 
-    nurse_shifts = _find_shifts(
-        shift_values, grupa="PIELEGNIARKA", modalnosc="ZDO", is_24h=False
-    )
+    nurse_shifts = buckets.get(("PIELEGNIARKA", "ZDO", False), [])
     if len(nurse_shifts) < 2:
         raise ValueError("Brak zmian dziennych/nocnych ZDO dla PIELEGNIARKA")
 
+    day_flags = calendar_module.day_off_flags(days)
+
+    # Dane wejsciowe sa juz zwalidowane (shifty przez Pydantic, dni przez
+    # kalendarz), wiec Demand to zwykla dataclassa bez walidacji.
+    def _demand(day, shift, min_staff: int, target_staff: int) -> Demand:
+        return Demand(
+            date=day,
+            shift_code=shift.code,
+            min_staff=min_staff,
+            target_staff=target_staff,
+            required_modalnosc=shift.modalnosc,
+            grupa=shift.grupa,
+        )
+
+    day_shift_plan = [
+        (er_mr[0], 1, 2),
+        (er_tk[0], 1, 1),
+        (er_tk[-1], 1, 1),
+    ]
+    nurse_plan = [(nurse_shifts[0], 1, 1), (nurse_shifts[-1], 1, 1)]
+    er_24h_shift = er_24h[0]
+
     demands: list[Demand] = []
-    for day in days:
-        is_weekend = calendar_module.is_weekend(day)
-        is_holiday = calendar_module.is_holiday(day)
-
-        if is_weekend or is_holiday:
-            shift = er_24h[0]
-            demands.append(
-                Demand(
-                    date=day,
-                    shift_code=shift.code,
-                    min_staff=1,
-                    target_staff=1,
-                    required_modalnosc=shift.modalnosc,
-                    grupa=shift.grupa,
-                )
-            )
+    for day, is_day_off in zip(days, day_flags):
+        if is_day_off:
+            demands.append(_demand(day, er_24h_shift, 1, 1))
         else:
-            mr_shift = er_mr[0]
-            tk_day = er_tk[0]
-            tk_night = er_tk[-1]
-            for shift, min_staff, target_staff in (
-                (mr_shift, 1, 2),
-                (tk_day, 1, 1),
-                (tk_night, 1, 1),
-            ):
-                demands.append(
-                    Demand(
-                        date=day,
-                        shift_code=shift.code,
-                        min_staff=min_staff,
-                        target_staff=target_staff,
-                        required_modalnosc=shift.modalnosc,
-                        grupa=shift.grupa,
-                    )
-                )
-
-        nurse_day = nurse_shifts[0]
-        nurse_night = nurse_shifts[-1]
-        for shift in (nurse_day, nurse_night):
-            demands.append(
-                Demand(
-                    date=day,
-                    shift_code=shift.code,
-                    min_staff=1,
-                    target_staff=1,
-                    required_modalnosc=shift.modalnosc,
-                    grupa=shift.grupa,
-                )
-            )
+            for shift, min_staff, target_staff in day_shift_plan:
+                demands.append(_demand(day, shift, min_staff, target_staff))
+
+        for shift, min_staff, target_staff in nurse_plan:
+            demands.append(_demand(day, shift, min_staff, target_staff))
 
     return demands
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from datetime import date, time
-from typing import Optional, Set
+from functools import lru_cache
+from typing import FrozenSet, Optional, Set
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, field_validator
+from pydantic.dataclasses import dataclass as pydantic_dataclass
 
 
 class Group(str, Enum):
@@ -13,34 +15,142 @@ class Group(str, Enum):
     PIELEGNIARKA = "PIELEGNIARKA"
 
 
-def normalize_group(value: object) -> str:
+# Bity umiejetnosci do szybkiego sprawdzania eligibility (maski int).
+SKILL_BITS = {"MR": 1, "TK": 2, "ZDO": 4, "ALL": 8}
+
+# Wartosci traktowane jako "prawda" w polach tak/nie z Excela.
+TRUE_STRINGS = frozenset({"tak", "t", "true", "1", "x", "yes", "y"})
+
+# Szybka sciezka dla typowych wartosci tak/nie: jeden lookup w dict
+# zamiast lancucha isinstance + strip/lower + test w secie.
+_BOOL_LUT: dict = {
+    True: True,
+    False: False,
+    1: True,  # int i float 1/0 hashuja tak samo
+    0: False,
+    None: False,
+    "tak": True,
+    "t": True,
+    "true": True,
+    "1": True,
+    "x": True,
+    "yes": True,
+    "y": True,
+    "nie": False,
+    "no": False,
+    "false": False,
+    "0": False,
+    "": False,
+}
+
+_BOOL_MISS = object()
+
+
+def parse_bool(value: object) -> bool:
+    """Sparsuj pole tak/nie z Excela; nieznane wartosci daja False."""
+    result = _BOOL_LUT.get(value, _BOOL_MISS)
+    if result is not _BOOL_MISS:
+        return result
+    if isinstance(value, float):
+        if value != value:  # NaN
+            return False
+        return bool(int(value))
+    if isinstance(value, int):
+        return bool(value)
+    return str(value).strip().lower() in TRUE_STRINGS
+
+
+def skill_mask(skills: Set[str], grupa: object = None) -> int:
+    """Zbuduj maske bitowa umiejetnosci; ALL przysluguje elektroradiologom."""
+    mask = sum(SKILL_BITS.get(skill, 0) for skill in skills)
+    if grupa == "ELEKTRORADIOLOG":
+        mask |= SKILL_BITS["ALL"]
+    return mask
+
+
+def required_skill_mask(modalnosc: Optional[str]) -> int:
+    return SKILL_BITS.get(modalnosc or "", 0)
+
+
+@lru_cache(maxsize=256)
+def _parse_time_str(text: str) -> time:
+    hour_str, _, minute_str = text.partition(":")
+    minute_str = minute_str.split(":", 1)[0] if minute_str else "0"
+    return time(int(hour_str), int(minute_str))
+
+
+def parse_time(value: object) -> Optional[time]:
+    """Sparsuj godzine z Excela ("7:00", "19:30", obiekt time).
+
+    Arkusze powtarzaja w kolko te same godziny, wiec cache stringow
+    trafia niemal zawsze.
+    """
     if value is None:
-        return ""
-    v = str(value).strip().lower()
+        return None
+    if isinstance(value, time):
+        return value
+    text = str(value).strip()
+    if not text:
+        return None
+    return _parse_time_str(text)
+
+
+@lru_cache(maxsize=64)
+def _normalize_group_str(stripped: str) -> str:
+    v = stripped.lower()
     if v in {"elektroradiolog", "er", "elektroradiolodzy", "elektroradiologzy"}:
         return "ELEKTRORADIOLOG"
     if v in {"pielęgniarka", "pielegniarka", "piel", "pielegniarki", "zdo"}:
         return "PIELEGNIARKA"
-    # jeśli ktoś wpisał już docelową wartość
-    if v in {"elektroradiolog".lower(), "pielegniarka".lower()}:
-        return v.upper()
-    return str(value).strip()
+    return stripped
+
+
+def normalize_group(value: object) -> str:
+    if value is None:
+        return ""
+    return _normalize_group_str(str(value).strip())
 
 
-class Employee(BaseModel):
+@lru_cache(maxsize=32)
+def _normalize_contract_str(raw: str) -> str:
+    # dopuszczamy warianty
+    s = raw.strip().upper()
+    if s in {"UOP", "UMOWA O PRACE", "UMOWAOPRACE"}:
+        return "UOP"
+    if s in {"B2B", "KONTRAKT"}:
+        return "B2B"
+    if s in {"ZLECENIE", "UMOWA ZLECENIE", "UZ"}:
+        return "ZLECENIE"
+    return s
+
+
+# Obiekty domenowe sa ladowane raz, a czytane milionami razy przez solver,
+# wiec trzymamy je jako dataclassy ze slotami (mniej pamieci, szybszy dostep).
+# Walidacje z Excela zapewnia pydantic.dataclasses + field_validatory.
+@pydantic_dataclass(slots=True)
+class Employee:
+    grupa: Group
+
     pracownik_id: Optional[str] = None
     imie_nazwisko: Optional[str] = None
     stanowisko: Optional[str] = None
 
-    grupa: Group
     typ_umowy: Optional[str] = None
     etat: Optional[float] = None
 
     moze_24h: bool = False
-    # Excel ma klucz "PN-PT" więc trzymamy alias:
-    PN_PT: bool = Field(default=False, alias="PN-PT")
+    # Kolumne "PN-PT" przemianowuje io_excel przy wczytywaniu.
+    PN_PT: bool = False
+
+    # frozenset: profile umiejetnosci sa wspoldzielone miedzy pracownikami
+    skills: FrozenSet[str] = field(default_factory=frozenset)
 
-    skills: Set[str] = Field(default_factory=set)
+    # Maska bitowa umiejetnosci liczona raz przy konstrukcji - solver
+    # testuje bity zamiast przynaleznosci do seta.
+    skill_bits: int = field(init=False, default=0)
+
+    def __post_init__(self) -> None:
+        self.skill_bits = skill_mask(self.skills, self.grupa)
 
     max_godz_tydz: Optional[float] = None
     cel_godz_miesiac: Optional[float] = None
@@ -49,6 +159,19 @@ class Employee(BaseModel):
 
     okres_rozliczeniowy_mies: int = 1
 
+    @property
+    def id(self) -> Optional[str]:
+        return self.pracownik_id
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.imie_nazwisko
+
+    @property
+    def auto_target(self) -> bool:
+        """Cel godzinowy liczony z etatu, gdy nie podano go wprost."""
+        return self.cel_godz_miesiac is None
+
     @field_validator("grupa", mode="before")
     @classmethod
     def _norm_group(cls, v):
@@ -58,36 +181,30 @@ class Employee(BaseModel):
     @classmethod
     def _skills_to_set(cls, v):
         if v is None:
-            return set()
-        if isinstance(v, set):
+            return frozenset()
+        if isinstance(v, (set, frozenset)):
             return v
-        if isinstance(v, list) or isinstance(v, tuple):
+        if isinstance(v, (list, tuple)):
             return {str(x) for x in v if x is not None and str(x).strip() != ""}
         if isinstance(v, str):
             # np. "MR+TK" lub "MR, TK"
             s = v.replace("+", ",")
             parts = [p.strip() for p in s.split(",")]
             return {p for p in parts if p}
-        return set()
+        return frozenset()
 
     @field_validator("typ_umowy", mode="before")
     @classmethod
     def _norm_umowa(cls, v):
         if v is None:
             return None
-        s = str(v).strip().upper()
-        # dopuszczamy warianty
-        if s in {"UOP", "UMOWA O PRACE", "UMOWAOPRACE"}:
-            return "UOP"
-        if s in {"B2B", "KONTRAKT"}:
-            return "B2B"
-        if s in {"ZLECENIE", "UMOWA ZLECENIE", "UZ"}:
-            return "ZLECENIE"
-        return s
-
-
-class ShiftType(BaseModel):
-    code: str = Field(alias="shift_code")
+        return _normalize_contract_str(str(v))
+
+
+@pydantic_dataclass(slots=True)
+class ShiftType:
+    # Kolumne "shift_code" przemianowuje io_excel przy wczytywaniu.
+    code: str
     grupa: Optional[str] = None
     modalnosc: Optional[str] = None
 
@@ -96,23 +213,59 @@ class ShiftType(BaseModel):
     czas_h: Optional[float] = None
     czy_24h: bool = False
 
+    # Minutowe offsety liczone raz w __post_init__ (sloty zamiast cached_property).
+    start_min: int = field(init=False, default=0)
+    end_min: int = field(init=False, default=0)
+    duration_min: int = field(init=False, default=0)
+
+    def __post_init__(self) -> None:
+        start = self.start_time
+        self.start_min = start.hour * 60 + start.minute
+        end = self.end_time
+        end_min = end.hour * 60 + end.minute
+        if end_min <= self.start_min:
+            # koniec po polnocy dnia startu
+            end_min += 24 * 60
+        self.end_min = end_min
+        self.duration_min = int(round(self.duration_h * 60))
+
+    @property
+    def is_24h(self) -> bool:
+        return self.czy_24h
+
+    @property
+    def start_time(self) -> time:
+        return parse_time(self.start) or time(0, 0)
+
+    @property
+    def end_time(self) -> time:
+        return parse_time(self.koniec) or self.start_time
+
+    @property
+    def duration_h(self) -> float:
+        if self.czas_h is not None:
+            return float(self.czas_h)
+        return (self.end_min - self.start_min) / 60.0
+
     @field_validator("czy_24h", mode="before")
     @classmethod
     def _to_bool(cls, v):
-        if v is None:
-            return False
-        s = str(v).strip().lower()
-        return s in {"tak", "t", "true", "1", "x", "yes", "y"}
+        return parse_bool(v)
 
 
-class Demand(BaseModel):
+# Demand budujemy wylacznie wewnetrznie (demand.py) z juz zwalidowanych
+# danych, wiec wystarczy zwykla zamrozona dataclassa.
+@dataclass(slots=True, frozen=True)
+class Demand:
     date: date
     shift_code: str
     min_staff: int = 1
     target_staff: int = 1
     required_modalnosc: Optional[str] = None
     grupa: Optional[str] = None
-    
+
+
+
 class Settings(BaseModel):
     timezone: str = "Europe/Warsaw"
 
@@ -2,11 +2,10 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
-from datetime import date
 from pathlib import Path
 
 import pandas as pd
+from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
 
 from scheduler import calendar_pl
@@ -15,18 +14,37 @@ from scheduler.report import summarize_employees
 from scheduler.solver import Assignment, SolveResult
 
 
-def _auto_fit_columns(worksheet) -> None:
-    for column_cells in worksheet.columns:
-        values = [str(cell.value) if cell.value is not None else "" for cell in column_cells]
-        max_length = max((len(value) for value in values), default=0)
-        column_letter = get_column_letter(column_cells[0].column)
-        worksheet.column_dimensions[column_letter].width = min(max_length + 2, 60)
+def _column_widths(header: list[object], rows: list[list[object]]) -> list[int]:
+    widths = [len(str(value)) for value in header]
+    for row in rows:
+        for idx, value in enumerate(row):
+            if value is None:
+                continue
+            length = len(value) if isinstance(value, str) else len(str(value))
+            if length > widths[idx]:
+                widths[idx] = length
+    return widths
 
 
-def _apply_sheet_formatting(worksheet) -> None:
+def _write_sheet(
+    workbook: Workbook,
+    sheet_name: str,
+    header: list[object],
+    rows: list[list[object]],
+) -> None:
+    worksheet = workbook.create_sheet(sheet_name)
+    # Tryb write-only: formatowanie ustawiamy przed dopisaniem wierszy.
     worksheet.freeze_panes = "A2"
-    worksheet.auto_filter.ref = worksheet.dimensions
-    _auto_fit_columns(worksheet)
+    if header:
+        last_column = get_column_letter(len(header))
+        worksheet.auto_filter.ref = f"A1:{last_column}{len(rows) + 1}"
+        for idx, width in enumerate(_column_widths(header, rows), start=1):
+            worksheet.column_dimensions[get_column_letter(idx)].width = min(
+                width + 2, 60
+            )
+    worksheet.append(header)
+    for row in rows:
+        worksheet.append(row)
 
 
 def export_schedule_excel(
@@ -41,40 +59,49 @@ def export_schedule_excel(
     days = calendar_pl.month_days(month)
     shift_codes = list(shifts.keys())
 
-    assignments_by_day_shift: dict[tuple[date, str], list[str]] = defaultdict(list)
-    for assignment in assignments:
-        assignments_by_day_shift[(assignment.date, assignment.shift_code)].append(
-            assignment.name
-        )
-
-    grafik_rows: list[dict[str, object]] = []
-    for day in days:
-        row: dict[str, object] = {"data": day}
-        for shift_code in shift_codes:
-            names = assignments_by_day_shift.get((day, shift_code), [])
-            row[shift_code] = ", ".join(sorted(names))
-        grafik_rows.append(row)
+    # Jedno sortowanie + groupby w pandas zamiast sorted()/join per komorka.
+    # Klucze kategoryczne: observed=False daje od razu pelna siatke
+    # dzien x zmiana (z pustymi komorkami) bez reindex.
+    assigns_df = pd.DataFrame(
+        {
+            "date": pd.Categorical(
+                [assignment.date for assignment in assignments], categories=days
+            ),
+            "shift_code": pd.Categorical(
+                [assignment.shift_code for assignment in assignments],
+                categories=shift_codes,
+            ),
+            "name": [assignment.name for assignment in assignments],
+        }
+    )
+    pivot = (
+        assigns_df.sort_values("name", kind="stable")
+        .groupby(["date", "shift_code"], observed=False, sort=False)["name"]
+        .agg(", ".join)
+        .unstack(fill_value="")
+        .fillna("")
+    )
 
-    grafik_df = pd.DataFrame(grafik_rows)
+    grafik_header: list[object] = ["data", *shift_codes]
+    grafik_rows: list[list[object]] = [
+        [day, *row]
+        for day, row in zip(days, pivot.itertuples(index=False, name=None))
+    ]
 
-    summary_df = pd.DataFrame(
-        summarize_employees(employees, assignments, shifts, days)
-    )
+    summaries = summarize_employees(employees, assignments, shifts, days)
+    summary_header: list[object] = list(summaries[0].keys()) if summaries else []
+    summary_rows: list[list[object]] = [
+        [summary.get(key) for key in summary_header] for summary in summaries
+    ]
 
+    violations_header: list[object] = ["naruszenie"]
     if solve_result.feasible:
-        violations_df = pd.DataFrame(
-            [{"naruszenie": solve_result.report or "OK"}]
-        )
+        violations_rows: list[list[object]] = [[solve_result.report or "OK"]]
     else:
-        violations_df = pd.DataFrame(
-            [{"naruszenie": solve_result.report or "Brak rozwiazania"}]
-        )
-
-    with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-        grafik_df.to_excel(writer, sheet_name="grafik", index=False)
-        summary_df.to_excel(writer, sheet_name="podsumowanie", index=False)
-        violations_df.to_excel(writer, sheet_name="naruszenia", index=False)
+        violations_rows = [[solve_result.report or "Brak rozwiazania"]]
 
-        for sheet_name in ("grafik", "podsumowanie", "naruszenia"):
-            worksheet = writer.sheets[sheet_name]
-            _apply_sheet_formatting(worksheet)
+    workbook = Workbook(write_only=True)
+    _write_sheet(workbook, "grafik", grafik_header, grafik_rows)
+    _write_sheet(workbook, "podsumowanie", summary_header, summary_rows)
+    _write_sheet(workbook, "naruszenia", violations_header, violations_rows)
+    workbook.save(output_path)
@@ -2,85 +2,200 @@
 
 from __future__ import annotations
 
+import dataclasses
+import importlib.util
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import pandas as pd
+from pydantic import TypeAdapter, ValidationError
 
-from scheduler.domain import Employee, ShiftType, normalize_group
+from scheduler.domain import Employee, ShiftType, normalize_group, parse_bool
+
+# Walidacja wsadowa: jeden adapter amortyzuje koszt dispatchu schematu.
+_EMPLOYEE_LIST_ADAPTER = TypeAdapter(list[Employee])
+_SHIFT_LIST_ADAPTER = TypeAdapter(list[ShiftType])
+
+# Pola przyjmowane przez konstruktor ShiftType - obce kolumny arkusza
+# odpadaja przed walidacja, zamiast byc ignorowane per wiersz.
+_SHIFT_FIELDS = frozenset(
+    field.name for field in dataclasses.fields(ShiftType) if field.init
+)
+
+# Aliasy naglowkow Excela per klucz logiczny (case-insensitive, bez spacji/myslnikow).
+_WANTED: dict[str, list[str]] = {
+    "pracownik_id": ["pracownik_id", "id", "pracownikid"],
+    "imie_nazwisko": ["imie_nazwisko", "imięinazwisko", "imieinazwisko", "nazwisko"],
+    "stanowisko": ["stanowisko", "rola"],
+    "grupa": ["grupa", "group"],
+    "typ_umowy": ["typ_umowy", "typumowy", "umowa"],
+    "etat": ["etat"],
+    "moze_24h": ["moze_24h", "moze24h", "24h", "czy24h"],
+    "PN_PT": ["pnpt", "pn-pt", "pnpt", "ponpt", "pon-pt"],
+    "MR": ["mr"],
+    "TK": ["tk"],
+    "max_godz_tydz": ["max_godz_tydz", "maxgodztydz", "maxtyg", "maxty", "maxtygodniowo"],
+    "cel_godz_miesiac": ["cel_godz_miesiac", "celgodzmiesiac", "cel", "target"],
+    "min_godz_miesiac": ["min_godz_miesiac", "mingodzmiesiac", "min"],
+    "max_godz_miesiac": ["max_godz_miesiac", "maxgodzmiesiac", "max"],
+}
+
+
+# Tabela usuwania dla str.translate: jeden przebieg w C zamiast lancucha
+# replace'ow alokujacego posrednie stringi.
+_STRIP_TABLE = str.maketrans("", "", " -_")
+
+
+def _normalize_header(s: str) -> str:
+    return str(s).casefold().translate(_STRIP_TABLE)
+
+
+# Znormalizowany alias -> klucz logiczny, zbudowane raz przy imporcie.
+_ALIAS_TO_KEY: dict[str, str] = {
+    _normalize_header(alias): key
+    for key, aliases in _WANTED.items()
+    for alias in aliases
+}
+
+
+# Dtype'y zadeklarowane przy odczycie: pandas rzutuje kolumny hurtowo
+# po stronie C zamiast per komorke w Pythonie. Klucze spoza arkusza sa
+# ignorowane, wiec wymieniamy wszystkie aliasy naglowkow.
+_TEXT_KEYS = frozenset(
+    {"pracownik_id", "imie_nazwisko", "stanowisko", "grupa", "typ_umowy"}
+)
+_NUMERIC_KEYS = frozenset(
+    {"etat", "max_godz_tydz", "cel_godz_miesiac", "min_godz_miesiac", "max_godz_miesiac"}
+)
+_SHEET_DTYPES: dict[str, dict[str, str]] = {
+    "pracownicy": {
+        **{alias: "string" for key in _TEXT_KEYS for alias in _WANTED[key]},
+        **{alias: "Float64" for key in _NUMERIC_KEYS for alias in _WANTED[key]},
+    },
+    "typy_zmian": {
+        "shift_code": "string",
+        "grupa": "string",
+        "modalnosc": "string",
+        "start": "string",
+        "koniec": "string",
+    },
+    "ustawienia_grup": {"grupa": "string"},
+}
+
+# Silnik calamine (Rust) parsuje xlsx wielokrotnie szybciej niz openpyxl;
+# to zaleznosc opcjonalna, wiec sprawdzamy dostepnosc raz przy imporcie.
+_EXCEL_ENGINE = (
+    "calamine" if importlib.util.find_spec("python_calamine") else "openpyxl"
+)
+
+
+@lru_cache(maxsize=4)
+def _excel_file_cached(path_str: str, mtime_ns: int) -> pd.ExcelFile:
+    # Jeden uchwyt ExcelFile na skoroszyt: zip/XML parsowany raz dla
+    # wszystkich arkuszy (pracownicy, typy_zmian, ustawienia_grup).
+    if _EXCEL_ENGINE == "openpyxl":
+        # Tryb read_only streamuje wiersze zamiast budowac pelny graf
+        # komorek ze stylami; formul i tak nie czytamy (data_only).
+        try:
+            return pd.ExcelFile(
+                path_str,
+                engine="openpyxl",
+                engine_kwargs={"read_only": True, "data_only": True},
+            )
+        except TypeError:
+            # starsze pandas bez engine_kwargs
+            pass
+    return pd.ExcelFile(path_str, engine=_EXCEL_ENGINE)
+
+
+@lru_cache(maxsize=8)
+def _read_sheet_cached(path_str: str, mtime_ns: int, sheet_name: str) -> pd.DataFrame:
+    return _excel_file_cached(path_str, mtime_ns).parse(
+        sheet_name, dtype=_SHEET_DTYPES.get(sheet_name)
+    )
 
 
 def _read_sheet(path: Path, sheet_name: str) -> pd.DataFrame:
-    return pd.read_excel(path, sheet_name=sheet_name)
+    # load_employees czyta takze ustawienia_grup z tego samego pliku -
+    # cache po (sciezka, mtime) oszczedza ponowny parse calego xlsx.
+    # Wpis uniewaznia sie sam, bo mtime wchodzi do klucza.
+    return _read_sheet_cached(str(path), path.stat().st_mtime_ns, sheet_name)
+
+
+@lru_cache(maxsize=16)
+def _colmap_for_columns(columns: tuple[str, ...]) -> dict[str, str]:
+    # kolumna Excela -> klucz logiczny, w orientacji gotowej dla df.rename
+    # Normalizacja calego indeksu naraz operacjami .str pandasa.
+    normalized = (
+        pd.Index(columns).astype(str).str.casefold().str.translate(_STRIP_TABLE)
+    )
+    mapping: dict[str, str] = {}
+    seen: set[str] = set()
+    for column_name, normalized_name in zip(columns, normalized):
+        key = _ALIAS_TO_KEY.get(normalized_name)
+        if key is not None and key not in seen:
+            seen.add(key)
+            mapping[column_name] = key
+    return mapping
 
 
 def _colmap(df: pd.DataFrame) -> dict[str, str]:
     """
     Mapuje kolumny Excela na klucze logiczne.
-    Działa case-insensitive i ignoruje spacje/myślniki.
+    Działa case-insensitive i ignoruje spacje/myślniki; wynik cache'owany
+    per układ kolumn, bo arkusze maja zwykle identyczne naglowki.
     """
-    def norm(s: str) -> str:
-        return str(s).strip().lower().replace(" ", "").replace("-", "")
-
-    wanted: dict[str, list[str]] = {
-        "pracownik_id": ["pracownik_id", "id", "pracownikid"],
-        "imie_nazwisko": ["imie_nazwisko", "imięinazwisko", "imieinazwisko", "nazwisko"],
-        "stanowisko": ["stanowisko", "rola"],
-        "grupa": ["grupa", "group"],
-        "typ_umowy": ["typ_umowy", "typumowy", "umowa"],
-        "etat": ["etat"],
-        "moze_24h": ["moze_24h", "moze24h", "24h", "czy24h"],
-        "PN-PT": ["pnpt", "pn-pt", "pnpt", "ponpt", "pon-pt"],
-        "MR": ["mr"],
-        "TK": ["tk"],
-        "max_godz_tydz": ["max_godz_tydz", "maxgodztydz", "maxtyg", "maxty", "maxtygodniowo"],
-        "cel_godz_miesiac": ["cel_godz_miesiac", "celgodzmiesiac", "cel", "target"],
-        "min_godz_miesiac": ["min_godz_miesiac", "mingodzmiesiac", "min"],
-        "max_godz_miesiac": ["max_godz_miesiac", "maxgodzmiesiac", "max"],
-    }
+    return _colmap_for_columns(tuple(df.columns))
 
-    actual = {norm(c): c for c in df.columns}
-    mapping: dict[str, str] = {}
-    for key, aliases in wanted.items():
-        for a in aliases:
-            na = norm(a)
-            if na in actual:
-                mapping[key] = actual[na]
-                break
-    return mapping
 
-
-def _to_bool(x: Any) -> bool:
-    if x is None:
-        return False
-    if isinstance(x, bool):
-        return x
-    if isinstance(x, (int, float)) and not pd.isna(x):
-        return bool(int(x))
-    s = str(x).strip().lower()
-    return s in {"tak", "t", "true", "1", "x", "yes", "y"}
+def _records_with_none(df: pd.DataFrame) -> list[dict[str, Any]]:
+    # NaN -> None wektorowo per kolumna (where + tolist), bez odpytywania
+    # pd.isna() dla kazdej komorki z osobna.
+    columns = {
+        name: df[name].astype(object).where(df[name].notna(), None).tolist()
+        for name in df.columns
+    }
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
 
 
 def load_group_settings(path: str | Path) -> dict[str, int]:
     source = Path(path)
     df = _read_sheet(source, "ustawienia_grup")
-    if df.empty:
+    if df.empty or "okres_rozliczeniowy_mies" not in df.columns:
         return {}
-    df = df.rename(columns=str).copy()
+    # zip po kolumnach zamiast iterrows - bez budowania Series per wiersz.
+    df = df.dropna(subset=["okres_rozliczeniowy_mies"])
+    grupa_values = df["grupa"] if "grupa" in df.columns else [None] * len(df)
     result: dict[str, int] = {}
-    for _, row in df.iterrows():
-        raw = row.get("grupa", "")
+    for raw, okres in zip(grupa_values, df["okres_rozliczeniowy_mies"]):
         grupa = normalize_group(raw) if raw is not None else ""
         grupa = str(grupa).strip()
-        if not grupa:
-            continue
-        okres = row.get("okres_rozliczeniowy_mies")
-        if pd.isna(okres):
-            continue
-        result[grupa] = int(okres)
+        if grupa:
+            result[grupa] = int(okres)
     return result
 
 
+# Skills liczone, nie czytane wprost: wspoldzielone frozensety per
+# (grupa, MR, TK), wiec wszyscy pracownicy o tym samym profilu wskazuja
+# na jeden obiekt.
+_EMPTY_SKILLS: frozenset[str] = frozenset()
+_SKILL_TABLE: dict[tuple[str, bool, bool], frozenset[str]] = {
+    ("ELEKTRORADIOLOG", False, False): _EMPTY_SKILLS,
+    ("ELEKTRORADIOLOG", True, False): frozenset({"MR"}),
+    ("ELEKTRORADIOLOG", False, True): frozenset({"TK"}),
+    ("ELEKTRORADIOLOG", True, True): frozenset({"MR", "TK"}),
+    ("PIELEGNIARKA", False, False): frozenset({"ZDO"}),
+    ("PIELEGNIARKA", True, False): frozenset({"ZDO"}),
+    ("PIELEGNIARKA", False, True): frozenset({"ZDO"}),
+    ("PIELEGNIARKA", True, True): frozenset({"ZDO"}),
+}
+
+
+def _build_skills(grupa: str, has_mr: bool, has_tk: bool) -> frozenset[str]:
+    return _SKILL_TABLE.get((grupa, has_mr, has_tk), _EMPTY_SKILLS)
+
+
 def load_employees(path: str | Path) -> list[Employee]:
     source = Path(path)
     df = _read_sheet(source, "pracownicy")
@@ -88,51 +203,93 @@ def load_employees(path: str | Path) -> list[Employee]:
         return []
 
     group_settings = load_group_settings(source)
-    cmap = _colmap(df)
-
-    records = df.where(pd.notna(df), None).to_dict(orient="records")
-    employees: list[Employee] = []
-
-    for record in records:
-        # Wyciągnij pola z możliwych nazw kolumn
-        def get(key: str, default=None):
-            col = cmap.get(key)
-            return record.get(col, default) if col else default
-
-        raw_grupa = get("grupa", "")
-        grupa_norm = normalize_group(raw_grupa)
-
-        # Skills liczone, nie czytane wprost
-        skills: set[str] = set()
-        if str(grupa_norm) == "ELEKTRORADIOLOG":
-            if _to_bool(get("MR")):
-                skills.add("MR")
-            if _to_bool(get("TK")):
-                skills.add("TK")
-        elif str(grupa_norm) == "PIELEGNIARKA":
-            skills.add("ZDO")
-
-        # Zbuduj rekord pod model Employee (klucze muszą pasować do domain.Employee)
-        normalized: dict[str, Any] = {
-            "pracownik_id": get("pracownik_id"),
-            "imie_nazwisko": get("imie_nazwisko"),
-            "stanowisko": get("stanowisko"),
-            "grupa": grupa_norm,
-            "typ_umowy": get("typ_umowy"),
-            "etat": get("etat"),
-            "moze_24h": _to_bool(get("moze_24h", False)),
-            "PN-PT": _to_bool(get("PN-PT", False)),
-            "skills": skills,
-            "max_godz_tydz": get("max_godz_tydz"),
-            "cel_godz_miesiac": get("cel_godz_miesiac"),
-            "min_godz_miesiac": get("min_godz_miesiac"),
-            "max_godz_miesiac": get("max_godz_miesiac"),
-            "okres_rozliczeniowy_mies": group_settings.get(str(grupa_norm), 1),
-        }
+    # Przemianuj kolumny Excela na klucze logiczne raz, dla calej ramki.
+    df = df.rename(columns=_colmap(df))
 
-        employees.append(Employee.model_validate(normalized))
+    def column(key: str) -> list[Any]:
+        if key in df.columns:
+            series = df[key]
+            # NaN/NA -> None po stronie pandas, bez petli po komorkach.
+            return series.astype(object).where(series.notna(), None).tolist()
+        return [None] * len(df)
+
+    def bool_column(key: str) -> list[bool]:
+        # Series.map zamiast listy posredniej z None - parse_bool i tak
+        # mapuje NaN/None na False.
+        if key in df.columns:
+            return df[key].map(parse_bool).tolist()
+        return [False] * len(df)
+
+    # Grup jest ledwie kilka: normalizacja raz per wartosc, nie per wiersz
+    # (lru_cache w normalize_group i tak placi str/strip przy kazdym wywolaniu).
+    raw_grupa = column("grupa")
+    grupa_by_value = {value: normalize_group(value) for value in set(raw_grupa)}
+    grupa_col = [grupa_by_value[value] for value in raw_grupa]
+    moze_24h_col = bool_column("moze_24h")
+    pn_pt_col = bool_column("PN_PT")
+    mr_col = bool_column("MR")
+    tk_col = bool_column("TK")
+
+    records: list[dict[str, Any]] = [
+        {
+            "pracownik_id": pracownik_id,
+            "imie_nazwisko": imie_nazwisko,
+            "stanowisko": stanowisko,
+            "grupa": grupa,
+            "typ_umowy": typ_umowy,
+            "etat": etat,
+            "moze_24h": moze_24h,
+            "PN_PT": pn_pt,
+            "skills": _build_skills(grupa, has_mr, has_tk),
+            "max_godz_tydz": max_godz_tydz,
+            "cel_godz_miesiac": cel_godz_miesiac,
+            "min_godz_miesiac": min_godz_miesiac,
+            "max_godz_miesiac": max_godz_miesiac,
+            "okres_rozliczeniowy_mies": group_settings.get(grupa, 1),
+        }
+        for (
+            pracownik_id,
+            imie_nazwisko,
+            stanowisko,
+            grupa,
+            typ_umowy,
+            etat,
+            moze_24h,
+            pn_pt,
+            has_mr,
+            has_tk,
+            max_godz_tydz,
+            cel_godz_miesiac,
+            min_godz_miesiac,
+            max_godz_miesiac,
+        ) in zip(
+            column("pracownik_id"),
+            column("imie_nazwisko"),
+            column("stanowisko"),
+            grupa_col,
+            column("typ_umowy"),
+            column("etat"),
+            moze_24h_col,
+            pn_pt_col,
+            mr_col,
+            tk_col,
+            column("max_godz_tydz"),
+            column("cel_godz_miesiac"),
+            column("min_godz_miesiac"),
+            column("max_godz_miesiac"),
+        )
+    ]
 
-    return employees
+    try:
+        return _EMPLOYEE_LIST_ADAPTER.validate_python(records)
+    except ValidationError as exc:
+        # Indeks z loc to pozycja na liscie rekordow; +2 = naglowek i
+        # numeracja wierszy Excela od 1.
+        details = "; ".join(
+            f"wiersz {error['loc'][0] + 2}: {error['msg']}"
+            for error in exc.errors()[:5]
+        )
+        raise ValueError(f"Bledne dane w arkuszu pracownicy: {details}") from exc
 
 
 def load_shifts(path: str | Path) -> dict[str, ShiftType]:
@@ -140,9 +297,16 @@ def load_shifts(path: str | Path) -> dict[str, ShiftType]:
     df = _read_sheet(source, "typy_zmian")
     if df.empty:
         return {}
-    records = df.where(pd.notna(df), None).to_dict(orient="records")
-    shifts: dict[str, ShiftType] = {}
-    for record in records:
-        shift = ShiftType.model_validate(record)
-        shifts[shift.code] = shift
-    return shifts
+    df = df.rename(columns={"shift_code": "code"})
+    df = df[[column for column in df.columns if column in _SHIFT_FIELDS]]
+    records = _records_with_none(df)
+    try:
+        shifts = _SHIFT_LIST_ADAPTER.validate_python(records)
+    except ValidationError as exc:
+        # Jak w load_employees: indeks rekordu + 2 = wiersz arkusza.
+        details = "; ".join(
+            f"wiersz {error['loc'][0] + 2}: {error['msg']}"
+            for error in exc.errors()[:5]
+        )
+        raise ValueError(f"Bledne dane w arkuszu typy_zmian: {details}") from exc
+    return {shift.code: shift for shift in shifts}
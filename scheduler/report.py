@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
 from datetime import date
 
+import numpy as np
+
 from scheduler import calendar_pl
 from scheduler.domain import Employee, Settings, ShiftType
 from scheduler.solver import Assignment
@@ -20,35 +21,75 @@ def summarize_employees(
     if settings is None:
         settings = Settings()
 
-    workdays = sum(
-        1
+    # Kalendarz liczony raz per dzien miesiaca; przydzialy robia potem
+    # tylko tanie trafienia w slownik.
+    weekend_or_holiday = {
+        day: calendar_pl.is_weekend(day) or calendar_pl.is_holiday(day)
         for day in month_days
-        if not calendar_pl.is_weekend(day) and not calendar_pl.is_holiday(day)
-    )
+    }
+    workdays = sum(1 for flag in weekend_or_holiday.values() if not flag)
 
-    shift_by_code = shifts
-    assignments_by_employee: dict[str, list[Assignment]] = defaultdict(list)
-    for assignment in assignments:
-        assignments_by_employee[assignment.employee_id].append(assignment)
+    employee_count = len(employees)
 
-    summaries: list[dict[str, object]] = []
-    for employee in employees:
-        total_hours = 0.0
-        night_count = 0
-        weekend_count = 0
-        shift_24h_count = 0
-        for assignment in assignments_by_employee.get(employee.id, []):
-            shift = shift_by_code[assignment.shift_code]
-            total_hours += shift.duration_h
-            if shift.is_24h:
-                shift_24h_count += 1
-            if shift.end_time <= shift.start_time and not shift.is_24h:
-                night_count += 1
-            if calendar_pl.is_weekend(assignment.date) or calendar_pl.is_holiday(
-                assignment.date
-            ):
-                weekend_count += 1
+    totals = np.zeros(employee_count)
+    night_counts = np.zeros(employee_count)
+    weekend_counts = np.zeros(employee_count)
+    h24_counts = np.zeros(employee_count)
+
+    if assignments and employee_count:
+        # Agregaty liczone po stronie NumPy: jedno bincount per metryka
+        # zamiast petli w Pythonie po wszystkich przydzialach.
+        shift_codes = list(shifts)
+        code_index = {
+            shift_code: s_idx for s_idx, shift_code in enumerate(shift_codes)
+        }
+        # Tabela wag (3 x zmiana): godziny, noc, 24h - jeden gather po
+        # s_idx daje wszystkie metryki per przydzial.
+        shift_weights = np.array(
+            [
+                [shifts[shift_code].duration_h for shift_code in shift_codes],
+                [
+                    float(
+                        shifts[shift_code].end_time
+                        <= shifts[shift_code].start_time
+                        and not shifts[shift_code].is_24h
+                    )
+                    for shift_code in shift_codes
+                ],
+                [float(shifts[shift_code].is_24h) for shift_code in shift_codes],
+            ]
+        )
+        employee_index = {
+            employee.id: e_idx for e_idx, employee in enumerate(employees)
+        }
+        count = len(assignments)
+        emp_idx = np.fromiter(
+            (employee_index[a.employee_id] for a in assignments),
+            dtype=np.intp,
+            count=count,
+        )
+        s_idx = np.fromiter(
+            (code_index[a.shift_code] for a in assignments),
+            dtype=np.intp,
+            count=count,
+        )
+        weekend_weights = np.fromiter(
+            (weekend_or_holiday.get(a.date, False) for a in assignments),
+            dtype=np.float64,
+            count=count,
+        )
+        gathered = shift_weights[:, s_idx]
+        totals = np.bincount(emp_idx, weights=gathered[0], minlength=employee_count)
+        night_counts = np.bincount(
+            emp_idx, weights=gathered[1], minlength=employee_count
+        )
+        weekend_counts = np.bincount(
+            emp_idx, weights=weekend_weights, minlength=employee_count
+        )
+        h24_counts = np.bincount(emp_idx, weights=gathered[2], minlength=employee_count)
 
+    summaries: list[dict[str, object]] = []
+    for e_idx, employee in enumerate(employees):
         if employee.typ_umowy == "UOP" and employee.auto_target and employee.etat:
             target_hours = employee.etat * workdays * 7.5833
         else:
@@ -60,10 +101,10 @@ def summarize_employees(
                 "name": employee.name,
                 "grupa": employee.grupa,
                 "typ_umowy": employee.typ_umowy,
-                "total_hours": round(total_hours, 2),
-                "night_count": night_count,
-                "weekend_count": weekend_count,
-                "shift_24h_count": shift_24h_count,
+                "total_hours": round(float(totals[e_idx]), 2),
+                "night_count": int(night_counts[e_idx]),
+                "weekend_count": int(weekend_counts[e_idx]),
+                "shift_24h_count": int(h24_counts[e_idx]),
                 "target_hours": target_hours,
                 "min_hours": employee.min_godz_miesiac,
                 "max_hours": employee.max_godz_miesiac,
@@ -2,22 +2,12 @@
 
 from __future__ import annotations
 
+import os
 from collections import defaultdict
 from dataclasses import dataclass
 from datetime import date
 from typing import Iterable
 
-from ortools.sat.python import cp_model
-
-from scheduler.constraints_hard import (
-    add_max_consecutive_days,
-    add_min_coverage,
-    add_one_shift_per_day,
-    add_rest_constraints,
-    build_decision_vars,
-    eligible_for_shift,
-)
-from scheduler.constraints_soft import add_soft_constraints
 from scheduler.domain import Demand, Employee, Settings, ShiftType
 
 
@@ -43,14 +33,42 @@ def _collect_days(demands: Iterable[Demand]) -> list[date]:
 def _candidate_counts(
     demands: list[Demand],
     employees: list[Employee],
-    shifts: dict[str, ShiftType],
+    eligibility: dict[tuple[int, str], bool],
 ) -> dict[tuple[date, str], int]:
-    counts: dict[tuple[date, str], int] = {}
+    # Eligibility nie zalezy od dnia, wiec liczymy kandydatow raz per kod
+    # zmiany zamiast per demand.
+    per_shift: dict[str, int] = {}
+    for demand in demands:
+        shift_code = demand.shift_code
+        if shift_code not in per_shift:
+            per_shift[shift_code] = sum(
+                1
+                for e_idx in range(len(employees))
+                if eligibility[(e_idx, shift_code)]
+            )
+    return {
+        (demand.date, demand.shift_code): per_shift[demand.shift_code]
+        for demand in demands
+    }
+
+
+def _coverage_shortage_report(
+    demands: list[Demand],
+    candidate_counts: dict[tuple[date, str], int],
+) -> str | None:
+    shortage = defaultdict(list)
     for demand in demands:
-        shift = shifts[demand.shift_code]
-        count = sum(1 for employee in employees if eligible_for_shift(employee, shift))
-        counts[(demand.date, demand.shift_code)] = count
-    return counts
+        available = candidate_counts[(demand.date, demand.shift_code)]
+        if available < demand.min_staff:
+            shortage[demand.date].append(
+                f"{demand.shift_code}: {available}/{demand.min_staff}"
+            )
+    if not shortage:
+        return None
+    lines = ["Brak kandydatow dla demandow:"]
+    for day in sorted(shortage):
+        lines.append(f"- {day}: {', '.join(shortage[day])}")
+    return "\n".join(lines)
 
 
 def solve_schedule(
@@ -58,57 +76,109 @@ def solve_schedule(
     demands: list[Demand],
     shifts: dict[str, ShiftType],
     settings: Settings | None = None,
+    num_workers: int = 0,
+    time_limit_s: float | None = None,
+    previous_assignments: list[Assignment] | None = None,
 ) -> SolveResult:
+    # Import dopiero tutaj: ladowanie rozszerzenia ortools kosztuje setki
+    # milisekund, a report/cli potrzebuja z tego modulu tylko Assignment.
+    from ortools.sat.python import cp_model
+
+    from scheduler.constraints_hard import (
+        add_max_consecutive_days,
+        add_min_coverage,
+        add_one_shift_per_day,
+        add_rest_constraints,
+        build_decision_vars,
+        build_eligibility,
+        shift_code_index,
+    )
+    from scheduler.constraints_soft import add_soft_constraints
+
     if not demands:
         return SolveResult(feasible=True, assignments=[], report=None)
 
     days = _collect_days(demands)
+    eligibility = build_eligibility(employees, shifts)
+    code_index = shift_code_index(shifts)
+
+    # Tani pre-test pokrycia: jesli dla ktoregos demandu brakuje kandydatow,
+    # nie ma po co budowac modelu ani dowodzic infeasibility w CP-SAT.
+    candidate_counts = _candidate_counts(demands, employees, eligibility)
+    shortage_report = _coverage_shortage_report(demands, candidate_counts)
+    if shortage_report is not None:
+        return SolveResult(feasible=False, assignments=[], report=shortage_report)
+
     model = cp_model.CpModel()
-    variables = build_decision_vars(model, employees, days, shifts)
+    variables = build_decision_vars(model, employees, days, shifts, eligibility)
+
+    # Warm start: podpowiedzi z poprzedniego grafiku kieruja pierwsze
+    # rozwiazanie przy niemal identycznych przebiegach (drobne korekty).
+    if previous_assignments:
+        base_ordinal = days[0].toordinal()
+        employee_index = {
+            employee.id: e_idx for e_idx, employee in enumerate(employees)
+        }
+        for assignment in previous_assignments:
+            e_idx = employee_index.get(assignment.employee_id)
+            s_idx = code_index.get(assignment.shift_code)
+            if e_idx is None or s_idx is None:
+                continue
+            d_idx = assignment.date.toordinal() - base_ordinal
+            if not 0 <= d_idx < len(days):
+                continue
+            var = variables[e_idx][d_idx][s_idx]
+            if var is not None:
+                model.add_hint(var, 1)
 
-    add_min_coverage(model, demands, days, employees, shifts, variables)
+    add_min_coverage(
+        model, demands, days, employees, shifts, variables, eligibility, code_index
+    )
     add_one_shift_per_day(model, employees, days, shifts, variables)
     add_rest_constraints(model, employees, days, shifts, variables)
     add_max_consecutive_days(model, employees, days, shifts, variables)
     add_soft_constraints(model, employees, days, shifts, variables, settings=settings)
 
     solver = cp_model.CpSolver()
+    # 0 = automatycznie wszystkie rdzenie; portfel CP-SAT skaluje sie
+    # niemal liniowo do ~8 workerow.
+    solver.parameters.num_search_workers = (
+        num_workers if num_workers > 0 else max(1, os.cpu_count() or 1)
+    )
+    if time_limit_s is not None:
+        solver.parameters.max_time_in_seconds = time_limit_s
     status = solver.solve(model)
 
     if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-        candidate_counts = _candidate_counts(demands, employees, shifts)
-        shortage = defaultdict(list)
-        for demand in demands:
-            available = candidate_counts[(demand.date, demand.shift_code)]
-            if available < demand.min_staff:
-                shortage[demand.date].append(
-                    f"{demand.shift_code}: {available}/{demand.min_staff}"
-                )
-        if shortage:
-            lines = ["Brak kandydatow dla demandow:"]
-            for day in sorted(shortage):
-                lines.append(f"- {day}: {', '.join(shortage[day])}")
-            report = "\n".join(lines)
-        else:
-            report = "Model infeasible: brak szczegolowych wskazowek."
+        # Pokrycie bylo juz sprawdzone przed budowa modelu, wiec przyczyna
+        # lezy w innych ograniczeniach (odpoczynki, limity dni).
+        report = "Model infeasible: brak szczegolowych wskazowek."
         return SolveResult(feasible=False, assignments=[], report=report)
 
-    assignments: list[Assignment] = []
-    day_index = {day: idx for idx, day in enumerate(days)}
+    # Ekstrakcja wsadowa: jedna podroz przez FFI po wartosci wszystkich
+    # zmiennych demandow zamiast solver.value() per para (demand, pracownik).
+    base_ordinal = days[0].toordinal()
+    demand_vars: list[cp_model.IntVar] = []
+    demand_meta: list[tuple[Demand, Employee]] = []
     for demand in demands:
-        d_idx = day_index[demand.date]
+        d_idx = demand.date.toordinal() - base_ordinal
+        s_idx = code_index[demand.shift_code]
         for e_idx, employee in enumerate(employees):
-            key = (e_idx, d_idx, demand.shift_code)
-            var = variables.get(key)
-            if var is None:
-                continue
-            if solver.value(var) == 1:
-                assignments.append(
-                    Assignment(
-                        date=demand.date,
-                        shift_code=demand.shift_code,
-                        employee_id=employee.id,
-                        name=employee.name,
-                    )
-                )
+            var = variables[e_idx][d_idx][s_idx]
+            if var is not None:
+                demand_vars.append(var)
+                demand_meta.append((demand, employee))
+
+    assignments = [
+        Assignment(
+            date=demand.date,
+            shift_code=demand.shift_code,
+            employee_id=employee.id,
+            name=employee.name,
+        )
+        for (demand, employee), assigned in zip(
+            demand_meta, solver.boolean_values(demand_vars)
+        )
+        if assigned
+    ]
     return SolveResult(feasible=True, assignments=assignments, report=None)
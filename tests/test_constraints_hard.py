@@ -0,0 +1,64 @@
+import unittest
+
+from scheduler.constraints_hard import build_eligibility, eligible_for_shift
+from scheduler.domain import Employee, ShiftType
+
+
+def _employee(**kwargs) -> Employee:
+    base = {
+        "pracownik_id": "E1",
+        "imie_nazwisko": "Jan Kowalski",
+        "grupa": "ELEKTRORADIOLOG",
+        "skills": {"TK"},
+    }
+    base.update(kwargs)
+    return Employee(**base)
+
+
+def _shift(code: str, **kwargs) -> ShiftType:
+    base = {"code": code, "grupa": "ELEKTRORADIOLOG", "modalnosc": "TK"}
+    base.update(kwargs)
+    return ShiftType(**base)
+
+
+class EligibilityTests(unittest.TestCase):
+    def test_group_mismatch(self) -> None:
+        employee = _employee(grupa="PIELEGNIARKA", skills={"ZDO"})
+        self.assertFalse(eligible_for_shift(employee, _shift("TK_D")))
+
+    def test_missing_skill(self) -> None:
+        employee = _employee(skills={"MR"})
+        self.assertFalse(eligible_for_shift(employee, _shift("TK_D")))
+        self.assertTrue(eligible_for_shift(employee, _shift("MR_D", modalnosc="MR")))
+
+    def test_24h_requires_flag(self) -> None:
+        shift = _shift("D24", modalnosc="ALL", czy_24h="tak")
+        self.assertFalse(eligible_for_shift(_employee(moze_24h=False), shift))
+        self.assertTrue(eligible_for_shift(_employee(moze_24h=True), shift))
+
+    def test_all_modality_limited_to_elektroradiolog(self) -> None:
+        shift = _shift("D24", grupa="PIELEGNIARKA", modalnosc="ALL")
+        nurse = _employee(grupa="PIELEGNIARKA", skills={"ZDO"})
+        self.assertFalse(eligible_for_shift(nurse, shift))
+
+    def test_build_eligibility_matches_single_check(self) -> None:
+        employees = [
+            _employee(skills={"MR", "TK"}, moze_24h=True),
+            _employee(grupa="PIELEGNIARKA", skills={"ZDO"}),
+        ]
+        shifts = {
+            "MR_D": _shift("MR_D", modalnosc="MR"),
+            "ZDO_N": _shift("ZDO_N", grupa="PIELEGNIARKA", modalnosc="ZDO"),
+            "D24": _shift("D24", modalnosc="ALL", czy_24h="tak"),
+        }
+        eligibility = build_eligibility(employees, shifts)
+        for e_idx, employee in enumerate(employees):
+            for code, shift in shifts.items():
+                self.assertEqual(
+                    eligibility[(e_idx, code)],
+                    eligible_for_shift(employee, shift),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
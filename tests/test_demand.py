@@ -0,0 +1,57 @@
+import unittest
+from datetime import date
+
+from scheduler.demand import build_demands
+from scheduler.domain import ShiftType
+
+
+def _shifts() -> dict[str, ShiftType]:
+    rows = [
+        {"code": "D24", "grupa": "ELEKTRORADIOLOG", "modalnosc": "ALL",
+         "start": "8:00", "koniec": "8:00", "czy_24h": "tak"},
+        {"code": "MR_D", "grupa": "ELEKTRORADIOLOG", "modalnosc": "MR",
+         "start": "8:00", "koniec": "20:00"},
+        {"code": "TK_D", "grupa": "ELEKTRORADIOLOG", "modalnosc": "TK",
+         "start": "8:00", "koniec": "20:00"},
+        {"code": "TK_N", "grupa": "ELEKTRORADIOLOG", "modalnosc": "TK",
+         "start": "20:00", "koniec": "8:00"},
+        {"code": "ZDO_D", "grupa": "PIELEGNIARKA", "modalnosc": "ZDO",
+         "start": "7:00", "koniec": "19:00"},
+        {"code": "ZDO_N", "grupa": "PIELEGNIARKA", "modalnosc": "ZDO",
+         "start": "19:00", "koniec": "7:00"},
+    ]
+    shifts = {}
+    for row in rows:
+        shift = ShiftType(**row)
+        shifts[shift.code] = shift
+    return shifts
+
+
+class BuildDemandsTests(unittest.TestCase):
+    def test_weekday_and_weekend_rows(self) -> None:
+        demands = build_demands("2026-02", _shifts())
+        by_day = {}
+        for demand in demands:
+            by_day.setdefault(demand.date, []).append(demand.shift_code)
+
+        monday = by_day[date(2026, 2, 2)]
+        self.assertEqual(sorted(monday), ["MR_D", "TK_D", "TK_N", "ZDO_D", "ZDO_N"])
+
+        saturday = by_day[date(2026, 2, 7)]
+        self.assertEqual(sorted(saturday), ["D24", "ZDO_D", "ZDO_N"])
+
+    def test_missing_24h_shift_raises(self) -> None:
+        shifts = _shifts()
+        del shifts["D24"]
+        with self.assertRaises(ValueError):
+            build_demands("2026-02", shifts)
+
+    def test_mr_target_staff(self) -> None:
+        demands = build_demands("2026-02", _shifts())
+        mr = [d for d in demands if d.shift_code == "MR_D"]
+        self.assertTrue(mr)
+        self.assertTrue(all(d.min_staff == 1 and d.target_staff == 2 for d in mr))
+
+
+if __name__ == "__main__":
+    unittest.main()